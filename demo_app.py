@@ -1,7 +1,5 @@
 """Demo Panel app showing both programmatic and button screenshot usage."""
 
-import asyncio
-
 import panel as pn
 from screenshot import save_screenshot
 
@@ -26,14 +24,14 @@ async def on_run(event):
     """Handle the Run Report button click.
 
     Captures the current app state as a PNG screenshot and logs the
-    resulting file path.  Runs the blocking screenshot capture in a
-    separate thread so the Tornado event loop stays responsive.
+    resulting file path.  ``save_screenshot`` is async and awaits
+    Playwright directly, so the Tornado event loop stays responsive.
 
     Args:
         event: The Bokeh button-click event (unused, required by
             ``on_click`` callback signature).
     """
-    path = await asyncio.to_thread(save_screenshot, lambda: app)
+    path = await save_screenshot(lambda: app)
     print(f"Screenshot saved to {path}")
 
 
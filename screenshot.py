@@ -4,92 +4,622 @@ Captures the current layout state (with live widget values and full
 styling) by saving to HTML via Panel's ``save()`` method, then rendering
 to PNG with Playwright.
 
+Two entry points: ``save_screenshot`` renders the layout to an image
+through headless Chromium, while ``save_html`` returns just the
+standalone HTML (same widget state and styling) without touching the
+browser -- much cheaper when pixels aren't needed.
+
 Example::
 
     from screenshot import save_screenshot
 
-    def on_run(event):
-        path = save_screenshot(app)
+    async def on_run(event):
+        path = await save_screenshot(lambda: app)
         print(f"Saved: {path}")
 
     app = pn.Column("# My App", slider)
 """
 
+import asyncio
+import atexit
+import hashlib
+import json
 import logging
 import os
+import itertools
 import re
-import tempfile
-import threading
+import time
+import weakref
+from collections import OrderedDict
 from collections.abc import Callable
-from datetime import datetime
-from typing import Union
+from html import escape
+from io import StringIO
+from typing import Literal, Union
 
 import panel as pn
+from bokeh.core.json_encoder import serialize_json
+from bokeh.document import Document
+from bokeh.embed.util import standalone_docs_json_and_render_items
 from bokeh.resources import INLINE
 
 log = logging.getLogger(__name__)
 
+# Relative asset prefix Panel emits when save() runs inside a server session.
+_PANEL_STATIC_PREFIX = "static/extensions/panel/"
+
+# CDN mirror of those assets for the installed Panel version.  The version
+# is fixed for the process lifetime, so build the base URL once at import.
+_CDN_BASE = f"https://cdn.holoviz.org/panel/{pn.__version__}/dist"
+
+# Default render viewport; pages taller than this get a one-off taller
+# viewport rather than Chromium's full-page re-tile path.
+_VIEWPORT = {"width": 1280, "height": 720}
+
+# Number of pooled browsers, i.e. how many screenshots can render in
+# parallel before callers queue on the pool.
+_POOL_SIZE = int(os.environ.get("SCREENSHOT_POOL_SIZE", "2"))
+
+# Filename extension per supported screenshot encoding.  JPEG encoding is
+# SIMD-accelerated inside Chromium and several times cheaper (and smaller)
+# than PNG's DEFLATE pass; Playwright does not support WebP screenshots.
+_FORMAT_EXTENSIONS = {"png": ".png", "jpeg": ".jpg"}
+_JPEG_QUALITY = 85
+
+# Injected into the saved HTML so Playwright can wait for Bokeh to finish
+# rendering instead of sleeping for a fixed interval.  The flag is reset
+# to false synchronously (inline scripts run during document.write, before
+# set_content resolves): pooled pages share one window across renders, so
+# a stale true from the previous capture must not satisfy the next wait.
+_READY_SCRIPT = """\
+<script>
+  window.__panel_ready = false;
+  (function () {
+    function check() {
+      var docs = window.Bokeh && window.Bokeh.documents;
+      if (docs && docs.length > 0 && docs[0].is_idle) {
+        window.__panel_ready = true;
+      } else {
+        setTimeout(check, 50);
+      }
+    }
+    check();
+  })();
+</script>
+"""
+
 
-def _fix_panel_css_paths(html_path: str) -> None:
-    """Replace relative Panel CSS paths with CDN URLs.
+# CDN asset bodies keyed by URL: (body, content_type, status).  Populated
+# on first fetch and served from memory afterwards, so only the first
+# screenshot in a process pays the TLS handshake and round-trips.
+_asset_cache: dict = {}
 
-    Panel's ``save()`` emits relative ``static/extensions/panel/...``
-    paths when called inside a running server session.  These break when
-    the HTML is opened via ``file://``.  This function rewrites them to
-    absolute CDN URLs based on the installed Panel version.
+
+async def _serve_cached_asset(route) -> None:
+    """Fulfill a CDN asset request from the in-memory cache.
+
+    On a cache miss the request is fetched once over the network and the
+    response body is retained for every later render.  Fetch failures
+    fall through to the network so a flaky first call cannot poison the
+    cache.
 
     Args:
-        html_path: Path to the saved HTML file.  The file is modified
-            in-place.
+        route: The intercepted Playwright route.
     """
-    with open(html_path, "r") as f:
-        html = f.read()
+    url = route.request.url
+    cached = _asset_cache.get(url)
+    if cached is None:
+        try:
+            response = await route.fetch()
+            cached = (
+                await response.body(),
+                response.headers.get("content-type", ""),
+                response.status,
+            )
+        except Exception:
+            await route.continue_()
+            return
+        if cached[2] == 200:
+            _asset_cache[url] = cached
+    body, content_type, status = cached
+    await route.fulfill(status=status, body=body, content_type=content_type)
+
+
+class _BrowserPool:
+    """Pool of warm headless Chromium instances shared across screenshots.
+
+    Launching Chromium is by far the dominant cost of a screenshot
+    (hundreds of ms to seconds of cold start), so browsers are launched
+    once on first use and reused for every subsequent call.  Each pooled
+    browser keeps a long-lived ``BrowserContext`` and ``Page`` as well,
+    amortizing JS context init and viewport setup across calls -- a
+    screenshot only has to ``set_content`` and capture.  Everything is
+    closed via an ``atexit`` hook.
+
+    The pool size bounds render concurrency: up to ``size`` screenshots
+    proceed in parallel (distinct users or a burst of clicks), and
+    further callers wait in ``acquire()`` until a page frees up.  Set
+    the ``SCREENSHOT_POOL_SIZE`` environment variable to trade memory
+    (one Chromium each) for parallelism.
+
+    Browsers are launched with ``channel="chromium"`` to get the new
+    headless mode (full Chromium) instead of the legacy headless shell,
+    which is measurably slower per action and renders less faithfully.
+    """
+
+    def __init__(self, size: int = 2):
+        self._size = size
+        self._lock = asyncio.Lock()
+        self._playwright = None
+        self._pages: asyncio.Queue = asyncio.Queue()
+        self._browsers: list = []
+        self._started = False
+
+    async def _ensure_started(self) -> None:
+        async with self._lock:
+            if self._started:
+                return
+            from playwright.async_api import async_playwright
+
+            self._playwright = await async_playwright().start()
+            for _ in range(self._size):
+                self._pages.put_nowait(await self._new_page())
+            self._started = True
+            atexit.register(self._shutdown_sync)
+
+    async def _new_page(self):
+        """Launch a fresh browser and return its warm page."""
+        browser = await self._playwright.chromium.launch(
+            headless=True, channel="chromium"
+        )
+        context = await browser.new_context(viewport=_VIEWPORT)
+        await context.route(f"{_CDN_BASE}/**", _serve_cached_asset)
+        page = await context.new_page()
+        self._browsers.append(browser)
+        return page
+
+    async def acquire(self):
+        """Return a warm, live page, launching the pool on first use.
+
+        A pooled browser can crash or disconnect between uses; dead
+        handles are replaced with a fresh launch rather than handed out.
+        """
+        await self._ensure_started()
+        while True:
+            page = await self._pages.get()
+            browser = page.context.browser
+            if browser is None or browser.is_connected():
+                return page
+            await self.discard(page)
+
+    def release(self, page) -> None:
+        """Return a page to the pool for reuse."""
+        self._pages.put_nowait(page)
+
+    async def discard(self, page) -> None:
+        """Replace a page whose browser crashed or misbehaved.
+
+        Closes the page's browser and launches a fresh one into the
+        pool, so one Chromium crash costs a relaunch instead of
+        permanently poisoning a pool slot.
+        """
+        browser = page.context.browser
+        try:
+            if browser is not None:
+                await browser.close()
+        except Exception:
+            pass
+        if browser in self._browsers:
+            self._browsers.remove(browser)
+        self._pages.put_nowait(await self._new_page())
+
+    async def shutdown(self) -> None:
+        """Close all pooled browsers and stop Playwright."""
+        async with self._lock:
+            if not self._started:
+                return
+            for browser in self._browsers:
+                try:
+                    await browser.close()
+                except Exception:
+                    pass
+            self._browsers.clear()
+            while not self._pages.empty():
+                self._pages.get_nowait()
+            await self._playwright.stop()
+            self._started = False
+
+    def _shutdown_sync(self) -> None:
+        # atexit cannot await; best effort -- Chromium subprocesses are
+        # reaped by the OS at interpreter exit regardless.
+        try:
+            asyncio.run(self.shutdown())
+        except Exception:
+            pass
+
+
+_pool = _BrowserPool(_POOL_SIZE)
+
+
+class _RewritingWriter(StringIO):
+    """File-like buffer that fixes Panel CSS paths while being written.
 
-    version = pn.__version__
-    cdn_base = f"https://cdn.holoviz.org/panel/{version}/dist"
+    Panel's ``save()`` emits relative ``static/extensions/panel/...``
+    paths when called inside a running server session.  These break
+    outside that server, so they are rewritten to absolute CDN URLs
+    based on the installed Panel version.  Doing the rewrite chunk by
+    chunk as Bokeh streams the HTML out avoids a second full pass over
+    a document that INLINE resources can make multi-MB.  A prefix
+    occurrence may straddle two ``write()`` chunks, so any trailing
+    partial match of the prefix is held back until more data arrives.
+
+    A plain prefix swap is a C-level byte scan, far cheaper than a
+    regex pass.  Any trailing ``?v=...`` cache buster survives as a
+    query string on the CDN URL, which is harmless.
+    """
+
+    _HOLDBACK = len(_PANEL_STATIC_PREFIX) - 1
+
+    _CDN_PREFIX = _CDN_BASE + "/"
+
+    def __init__(self):
+        super().__init__()
+        self._pending = ""
+
+    def write(self, chunk: str) -> int:
+        data = self._pending + chunk
+        self._pending = ""
+        for k in range(min(self._HOLDBACK, len(data)), 0, -1):
+            if data.endswith(_PANEL_STATIC_PREFIX[:k]):
+                self._pending = data[-k:]
+                data = data[:-k]
+                break
+        if data:
+            super().write(data.replace(_PANEL_STATIC_PREFIX, self._CDN_PREFIX))
+        return len(chunk)
+
+    def getvalue(self) -> str:
+        if self._pending:
+            # A held-back partial prefix can never be a complete match.
+            super().write(self._pending)
+            self._pending = ""
+        return super().getvalue()
+
+
+# Generated HTML memoized by layout identity + widget state, LRU-bounded.
+_HTML_CACHE_MAX = 8
+_html_cache: OrderedDict = OrderedDict()
+
+# The two regions of a saved document that change between captures of the
+# same layout: the Bokeh document JSON payload and the render_items
+# literal in the embed script.
+_DOCS_JSON_RE = re.compile(
+    r'(<script type="application/json"[^>]*>)(.*?)(</script>)', re.DOTALL
+)
+_RENDER_ITEMS_RE = re.compile(r"const render_items = (\[.*?\]);", re.DOTALL)
+
+
+class _ShellTemplate:
+    """Static HTML shell for a layout, minus the Bokeh document JSON.
+
+    Panel's ``save()`` re-serializes every INLINE CSS/JS bundle on each
+    call even though only the Bokeh document JSON differs between
+    captures of the same layout.  The shell splits one fully generated
+    document around its two dynamic regions -- the
+    ``application/json`` payload and the ``render_items`` literal -- so
+    later captures serialize just the document JSON (KBs, not MBs) and
+    splice it into the cached markup.  New root element ids are remapped
+    onto the shell's existing ``<div>`` ids in order.
+    """
+
+    def __init__(self, head: str, mid: str, tail: str, element_ids: list):
+        self._head = head
+        self._mid = mid
+        self._tail = tail
+        self._element_ids = element_ids
+
+    @classmethod
+    def from_html(cls, html: str):
+        """Split a generated document into a shell, or return ``None``.
+
+        Returns ``None`` when the document does not have the expected
+        single JSON payload followed by a render_items literal, in
+        which case callers simply keep regenerating full documents.
+        """
+        m_json = _DOCS_JSON_RE.search(html)
+        if m_json is None or _DOCS_JSON_RE.search(html, m_json.end()):
+            return None
+        m_items = _RENDER_ITEMS_RE.search(html, m_json.end())
+        if m_items is None:
+            return None
+        try:
+            items = json.loads(m_items.group(1))
+        except ValueError:
+            return None
+        element_ids = [
+            elt for item in items for elt in item.get("roots", {}).values()
+        ]
+        if not element_ids:
+            return None
+        return cls(
+            html[: m_json.start(2)],
+            html[m_json.end(2) : m_items.start(1)],
+            html[m_items.end(1) :],
+            element_ids,
+        )
+
+    def render(self, target: pn.viewable.Viewable) -> str:
+        """Produce a full document for ``target``'s current state."""
+        doc = Document()
+        root = target.get_root(doc)
+        # Panel's get_root builds the model for doc but never attaches it;
+        # standalone serialization requires the root to be part of the
+        # Document.
+        doc.add_root(root)
+        docs_json, render_items = standalone_docs_json_and_render_items(
+            [root], suppress_callback_warning=True
+        )
+        items = [item.to_json() for item in render_items]
+        shell_ids = iter(self._element_ids)
+        for item in items:
+            item["roots"] = {rid: next(shell_ids) for rid in item["roots"]}
+        payload = escape(serialize_json(docs_json), quote=False)
+        html = (
+            self._head
+            + payload
+            + self._mid
+            + serialize_json(items, pretty=False)
+            + self._tail
+        )
+        # The fresh JSON may carry relative asset paths just like the
+        # original document did.
+        return html.replace(_PANEL_STATIC_PREFIX, _RewritingWriter._CDN_PREFIX)
+
+
+# Shell cached for the most recently captured layout, keyed by its
+# weakref-backed token (see _layout_token) so a different layout object
+# invalidates it and a recycled address can't alias a dead layout's shell.
+_shell_cache: dict = {}
+
+
+# Stable identity tokens for live layouts.  id() is unusable as a cache
+# key on a multi-session server: layouts are created and collected
+# constantly and CPython reuses freed addresses, so a new layout could
+# silently hit a dead layout's cache entries.  The weak mapping drops a
+# token when its layout is collected, and tokens are never reused.
+_layout_tokens: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+_layout_token_counter = itertools.count()
+
+
+def _layout_token(target: pn.viewable.Viewable) -> int:
+    """Return a process-unique identity token for a live layout."""
+    token = _layout_tokens.get(target)
+    if token is None:
+        token = next(_layout_token_counter)
+        _layout_tokens[target] = token
+    return token
+
+
+def _state_key(target: pn.viewable.Viewable) -> bytes:
+    """Hash a layout's identity and current widget values.
+
+    Two calls with the same layout object and unchanged widget values
+    produce the same key, letting ``save_screenshot`` skip the
+    (multi-MB) HTML re-serialization entirely.
+
+    Args:
+        target: The resolved Panel component being captured.
 
-    # Replace relative paths like: static/extensions/panel/css/markdown.css?v=1.8.7
-    html = re.sub(
-        r"static/extensions/panel/([^\"'?\s]+)(\?[^\"']*)?",
-        lambda m: f"{cdn_base}/{m.group(1)}",
-        html,
+    Returns:
+        A 16-byte digest of the layout token and widget state.
+    """
+    widgets = target.select(pn.widgets.Widget)
+    state = repr(
+        (_layout_token(target), tuple((w.name, w.value) for w in widgets))
     )
+    return hashlib.blake2b(state.encode(), digest_size=16).digest()
+
+
+def _inject_ready_script(html: str) -> str:
+    """Append the Bokeh readiness script to a saved HTML document.
 
-    with open(html_path, "w") as f:
-        f.write(html)
+    The script sets ``window.__panel_ready`` once Bokeh reports the
+    document idle, so rendering can wait on an event rather than a
+    fixed timeout.
 
+    Args:
+        html: The saved HTML document.
+
+    Returns:
+        The HTML with the readiness script injected.
+    """
+    if "</body>" in html:
+        return html.replace("</body>", f"{_READY_SCRIPT}</body>", 1)
+    return html + _READY_SCRIPT
 
-def _render_html_to_png(html_path: str, output_path: str) -> None:
-    """Render an HTML file to a PNG image using Playwright.
 
-    Launches a headless Chromium browser, navigates to the local HTML
-    file, waits for network activity to settle, and saves a full-page
-    screenshot.  Safe to call from any thread.
+async def _render_html_to_png(
+    html: str, output_path: str, format: str = "png"
+) -> None:
+    """Render an HTML document to an image using Playwright.
+
+    Borrows a warm page from the module-level pool, loads the HTML
+    string into it, waits for Bokeh to report the document idle, and
+    saves a screenshot.  Uses Playwright's async API so it can run
+    directly on the event loop.
 
     Args:
-        html_path: Absolute path to the HTML file to render.
-        output_path: Absolute path where the PNG will be written.
+        html: Standalone HTML document to render.
+        output_path: Absolute path where the image will be written.
+        format: Screenshot encoding, ``"png"`` or ``"jpeg"``.
     """
-    from playwright.sync_api import sync_playwright
+    page = await _pool.acquire()
+    try:
+        if page.viewport_size != _VIEWPORT:
+            await page.set_viewport_size(_VIEWPORT)
+        # "load" rather than "networkidle": CDN assets are served from the
+        # in-memory cache after the first call, and the readiness flag
+        # below is what actually gates the capture.
+        await page.set_content(html, wait_until="load")
+        try:
+            await page.wait_for_function(
+                "window.__panel_ready === true", timeout=5000
+            )
+        except Exception:
+            # Best effort: screenshot whatever has rendered by now rather
+            # than failing the whole call on a missed readiness signal.
+            log.warning("Timed out waiting for Bokeh readiness signal")
+        # Grow the viewport to the content height when needed instead of
+        # full_page=True -- a plain viewport capture skips Chromium's
+        # full-page re-tile path and encodes no excess pixels.
+        height = await page.evaluate("document.documentElement.scrollHeight")
+        if height > _VIEWPORT["height"]:
+            await page.set_viewport_size(
+                {"width": _VIEWPORT["width"], "height": height}
+            )
+        shot_kwargs = {"path": output_path, "type": format}
+        if format == "jpeg":
+            shot_kwargs["quality"] = _JPEG_QUALITY
+        await page.screenshot(**shot_kwargs)
+        # Blank the document so the previous render can't leak into (or
+        # hold memory across) the next use of this page.
+        await page.evaluate("document.open(); document.close()")
+    except Exception:
+        # The failure may mean the browser crashed or disconnected, in
+        # which case recycling this page would poison the pool slot.
+        await _pool.discard(page)
+        raise
+    _pool.release(page)
+
+
+def _generate_html(target: pn.viewable.Viewable, state_key: bytes) -> str:
+    """Produce the standalone HTML for ``target``'s current state.
+
+    Pure serialization, entirely in memory -- CSS paths are rewritten
+    as the HTML streams out.  Unchanged widget state reuses the
+    previously generated document, and a changed state for a known
+    layout only re-serializes the document JSON into the cached shell.
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page(viewport={"width": 1280, "height": 720})
-        page.goto(f"file://{html_path}", wait_until="networkidle")
-        page.wait_for_timeout(2000)
-        page.screenshot(path=output_path, full_page=True)
-        browser.close()
+    Args:
+        target: The resolved Panel component being captured.
+        state_key: The ``_state_key`` digest for ``target``.
 
+    Returns:
+        A standalone HTML document with CDN asset URLs and the
+        readiness script injected.
+    """
+    html = _html_cache.get(state_key)
+    if html is not None:
+        _html_cache.move_to_end(state_key)
+        return html
+
+    shell = _shell_cache.get(_layout_token(target))
+    if shell is not None:
+        try:
+            html = shell.render(target)
+        except Exception:
+            log.warning("Shell fast path failed; regenerating", exc_info=True)
+            _shell_cache.clear()
+    if html is None:
+        buf = _RewritingWriter()
+        target.save(buf, resources=INLINE)
+        html = _inject_ready_script(buf.getvalue())
+        shell = _ShellTemplate.from_html(html)
+        if shell is not None:
+            _shell_cache.clear()
+            _shell_cache[_layout_token(target)] = shell
+
+    _html_cache[state_key] = html
+    while len(_html_cache) > _HTML_CACHE_MAX:
+        _html_cache.popitem(last=False)
+    log.debug("Saved HTML (%d bytes)", len(html))
+    return html
+
+
+def save_html(
+    layout: Union[pn.viewable.Viewable, Callable[[], pn.viewable.Viewable]],
+    path: str | None = None,
+) -> str:
+    """Serialize a Panel layout to standalone HTML, skipping Playwright.
 
-def save_screenshot(
+    Consumers that want the document itself -- for archival, diffing,
+    or rendering elsewhere -- can use this instead of
+    ``save_screenshot`` and avoid the browser round-trip entirely.
+    The result is the exact HTML a screenshot would render: current
+    widget state, INLINE resources, CDN asset URLs, and the readiness
+    script.
+
+    Args:
+        layout: The Panel component to capture, or a zero-argument
+            callable returning one (use ``lambda: app`` for circular
+            references).
+        path: Optional file path; when given, the HTML is also written
+            there.
+
+    Returns:
+        The standalone HTML document as a string.
+    """
+    target = layout() if callable(layout) else layout
+    html = _generate_html(target, _state_key(target))
+    if path is not None:
+        with open(path, "w") as f:
+            f.write(html)
+    return html
+
+
+# Screenshot captures currently in progress, keyed by (state, dir, name).
+# Concurrent identical requests attach to the first caller's task instead
+# of launching a duplicate render pipeline.
+_inflight: dict = {}
+
+
+async def _capture(
+    target: pn.viewable.Viewable,
+    state_key: bytes,
+    save_dir: str,
+    filename: str | None,
+    format: str,
+) -> str:
+    """Generate the HTML for ``target`` and render it to an image."""
+    os.makedirs(save_dir, exist_ok=True)
+
+    ext = _FORMAT_EXTENSIONS[format]
+    if filename is None:
+        # f-string formatting of the struct_time fields skips strftime's
+        # locale machinery and the datetime object construction.
+        lt = time.localtime()
+        filename = (
+            f"screenshot_{lt.tm_year:04d}{lt.tm_mon:02d}{lt.tm_mday:02d}"
+            f"_{lt.tm_hour:02d}{lt.tm_min:02d}{lt.tm_sec:02d}{ext}"
+        )
+    else:
+        valid = (".jpg", ".jpeg") if format == "jpeg" else (".png",)
+        root, suffix = os.path.splitext(filename)
+        if suffix.lower() not in valid:
+            filename = root + ext
+
+    output_path = os.path.abspath(os.path.join(save_dir, filename))
+
+    html = _generate_html(target, state_key)
+
+    await _render_html_to_png(html, output_path, format)
+
+    log.info("Screenshot saved to %s", output_path)
+    return output_path
+
+
+async def save_screenshot(
     layout: Union[pn.viewable.Viewable, Callable[[], pn.viewable.Viewable]],
     save_dir: str = "screenshots",
     filename: str | None = None,
+    format: Literal["png", "jpeg"] = "png",
 ) -> str:
-    """Take a screenshot of a Panel layout and save it as a PNG file.
+    """Take a screenshot of a Panel layout and save it as an image file.
 
-    Captures the current widget state.  Safe to call from any Panel
-    callback -- Playwright runs in a separate thread automatically.
+    Captures the current widget state.  Safe to await from any Panel
+    callback -- rendering uses Playwright's async API directly on the
+    event loop, so no worker thread is involved.  Concurrent calls with
+    identical widget state (e.g. a double-clicked button) share a
+    single capture and receive the same path.
 
     Args:
         layout: The Panel component to capture (``Column``, ``Row``,
@@ -98,52 +628,32 @@ def save_screenshot(
         save_dir: Directory to save screenshots in.  Created
             automatically if it does not exist.
         filename: Output filename.  Defaults to
-            ``screenshot_YYYYMMDD_HHMMSS.png``.
+            ``screenshot_YYYYMMDD_HHMMSS`` plus the format's extension;
+            a mismatched extension is corrected automatically.
+        format: Image encoding.  PNG is lossless; JPEG (quality 85)
+            encodes several times faster and produces far smaller files,
+            which is usually the better trade for human inspection.
 
     Returns:
-        Absolute path to the saved PNG file.
+        Absolute path to the saved image file.
 
     Raises:
         Exception: Re-raises any exception that occurs during
-            Playwright rendering in the background thread.
+            Playwright rendering.
     """
-    target = layout() if callable(layout) else layout
-    os.makedirs(save_dir, exist_ok=True)
-
-    if filename is None:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"screenshot_{timestamp}.png"
+    if format not in _FORMAT_EXTENSIONS:
+        raise ValueError(f"Unsupported format: {format!r}")
 
-    output_path = os.path.abspath(os.path.join(save_dir, filename))
-    tmp_html_path = None
-
-    try:
-        # Save current layout state as standalone HTML (runs on caller thread)
-        fd, tmp_html_path = tempfile.mkstemp(suffix=".html", dir=save_dir)
-        os.close(fd)
-        target.save(tmp_html_path, resources=INLINE)
-        _fix_panel_css_paths(tmp_html_path)
-        log.info("Saved HTML (%d bytes)", os.path.getsize(tmp_html_path))
-
-        # Playwright must run outside the asyncio event loop, so use a thread
-        error = [None]
-
-        def _render():
-            try:
-                _render_html_to_png(tmp_html_path, output_path)
-            except Exception as e:
-                error[0] = e
-
-        t = threading.Thread(target=_render, daemon=True)
-        t.start()
-        t.join()
-
-        if error[0]:
-            raise error[0]
-
-        log.info("Screenshot saved to %s", output_path)
-        return output_path
-
-    finally:
-        if tmp_html_path and os.path.exists(tmp_html_path):
-            os.unlink(tmp_html_path)
+    target = layout() if callable(layout) else layout
+    state_key = _state_key(target)
+
+    key = (state_key, os.path.abspath(save_dir), filename, format)
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(
+            _capture(target, state_key, save_dir, filename, format)
+        )
+        _inflight[key] = task
+        task.add_done_callback(lambda _t: _inflight.pop(key, None))
+    # shield() so one caller being cancelled doesn't cancel the shared task.
+    return await asyncio.shield(task)